@@ -20,9 +20,12 @@ All will extend from the Player class (see structures.py), with strategies overw
 """
 
 from structures import Player
+from collections import Counter
 import random
 
 class Neutral_Bot(Player):
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -44,6 +47,11 @@ class Neutral_Bot(Player):
     
     
 class Aggro1_Bot(Player):
+    __slots__ = ()
+
+    # Bonus troops for three of a kind, from most to least valuable. One of each type is worth 10 (see Card).
+    SET_VALUES = {"Artillery": 8, "Cavalry": 6, "Infantry": 4}
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -55,14 +63,15 @@ class Aggro1_Bot(Player):
                 amount (int): Number of troops to draft (typically all available).
         """
         # Territory with most troops AND can attack (troops > 1 and enemy neighbor)
-        candidates = [
-            t for t in self.territories if t.armies > 1 and any(n.owner != self for n in t.neighbors)
-        ]
-        if not candidates:
-            # fallback: draft to territory with most troops
-            terr = max(self.territories, key=lambda t: t.armies)
-        else:
-            terr = max(candidates, key=lambda t: t.armies)
+        # Fallback: territory with most troops. Both are found in one pass.
+        terr = strongest = None
+        for t in self.territories:
+            if strongest is None or t.armies > strongest.armies:
+                strongest = t
+            if t.armies > 1 and t.enemy_neighbor_count and (terr is None or t.armies > terr.armies):
+                terr = t
+        if terr is None:
+            terr = strongest
         return terr, self.aatd  # draft all troops here
 
     def attack(self):
@@ -76,17 +85,16 @@ class Aggro1_Bot(Player):
                 Returns None if no valid attack is possible.
         """
         # Find strongest territory with troops > 2 that can attack
-        attackers = [
-            t for t in self.territories if t.armies > 2 and any(n.owner != self for n in t.neighbors)
-        ]
-        if not attackers:
+        A_star = None
+        for t in self.territories:
+            if t.armies > 2 and t.enemy_neighbor_count and (A_star is None or t.armies > A_star.armies):
+                A_star = t
+        if A_star is None:
             return None
 
-        A_star = max(attackers, key=lambda t: t.armies)
-
         # Weakest neighbor that can be attacked: troops < A_star.armies - 1
         targets = [
-            n for n in A_star.neighbors if n.owner != self and n.armies < A_star.armies - 1
+            n for n in A_star.neighbors if n.owner is not self and n.armies < A_star.armies - 1
         ]
         if not targets:
             return None
@@ -111,23 +119,19 @@ class Aggro1_Bot(Player):
         if from_territory:
             return from_territory.armies - 1
         # C*: strongest territory with no attackable neighbors
-        candidates_C = [
-            t for t in self.territories if not any(n.owner != self for n in t.neighbors)
-        ]
-        if not candidates_C:
-            return None  # skip fortify
-
-        C_star = max(candidates_C, key=lambda t: t.armies)
-
         # D*: strongest territory that can attack
-        candidates_D = [
-            t for t in self.territories if any(n.owner != self for n in t.neighbors)
-        ]
-        if not candidates_D:
+        C_star = D_star = None
+        for t in self.territories:
+            if t.enemy_neighbor_count:
+                if D_star is None or t.armies > D_star.armies:
+                    D_star = t
+            elif C_star is None or t.armies > C_star.armies:
+                C_star = t
+        if C_star is None:
+            return None  # skip fortify
+        if D_star is None:
             return None
 
-        D_star = max(candidates_D, key=lambda t: t.armies)
-
         if C_star == D_star or C_star.armies <= 1:
             return None  # no meaningful fortify move
 
@@ -140,65 +144,22 @@ class Aggro1_Bot(Player):
         Returns:
             list[Card] or None: The chosen set of cards to trade in, or None if no valid set.
         """
-        from collections import Counter
-        
-        cards = self.cards
-        n = len(cards)
-        if n < 3:
+        if len(self.cards) < 3:
             return None
-        
-        # Helper to get card types except jokers
-        def card_type(card):
-            return card.type
-        
-        # Find all 3-card subsets (since max 5 cards, 3-card combos are manageable)
-        subsets = []
-        # Manually enumerate 3-card combos without itertools:
-        for i in range(n-2):
-            for j in range(i+1, n-1):
-                for k in range(j+1, n):
-                    subsets.append([cards[i], cards[j], cards[k]])
-
-        best_set = None
-        best_value = -1
-
-        # Card values by type sets
-        value_map = {
-            "3 Infantry": 4,
-            "3 Cavalry": 6,
-            "3 Artillery": 8,
-            "1 Infantry + 1 Cavalry + 1 Artillery": 10
-        }
-
-        for subset in subsets:
-            types = [c.type for c in subset if c.type != "Joker"]
-            jokers = sum(1 for c in subset if c.type == "Joker")
-            unique_types = set(types)
-
-            # Check for 3 of a kind
-            if len(unique_types) == 1:
-                card_type_name = unique_types.pop()
-                # Adjust for jokers
-                count_needed = 3 - jokers
-                # We already have count_needed cards of this type because they form the subset
-                key = f"3 {card_type_name}"
-                val = value_map.get(key, 0)
-                if val > best_value:
-                    best_value = val
-                    best_set = subset
-
-            # Check for one of each type
-            needed_types = {"Infantry", "Cavalry", "Artillery"}
-            if len(unique_types) + jokers == 3 and unique_types.issubset(needed_types):
-                val = value_map["1 Infantry + 1 Cavalry + 1 Artillery"]
-                if val > best_value:
-                    best_value = val
-                    best_set = subset
-
-        return best_set
 
+        # The best set only depends on how many cards of each type we hold.
+        counts = Counter(card.type for card in self.cards)
+        jokers = [card for card in self.cards if card.type == "Joker"]
 
-    
+        # One of each type is worth the most. Jokers fill in for any missing types.
+        held_types = [card_type for card_type in self.SET_VALUES if counts[card_type] >= 1]
+        if len(held_types) + len(jokers) >= 3:
+            chosen_set = [next(card for card in self.cards if card.type == card_type) for card_type in held_types]
+            return (chosen_set + jokers)[:3]
 
-    
-    
\ No newline at end of file
+        # Otherwise the most valuable three of a kind, again using jokers as needed.
+        for card_type in self.SET_VALUES:
+            if counts[card_type] >= 1 and counts[card_type] + len(jokers) >= 3:
+                return ([card for card in self.cards if card.type == card_type] + jokers)[:3]
+
+        return None
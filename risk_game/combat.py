@@ -4,8 +4,8 @@ combat.py
 Implementation for combat systems in RISK.
 
 Note: Bulit from scratch, NOT fully accurate to real game's simulation rules. 
-Probability calculations performed via Monte Carlo. # of simulations will be kept low (~10000) for performance.
-Expected performance issues when calculating battles involving high amounts of troops (70+ troops?)
+Win probabilities are computed exactly with a DP over (attackers, defenders), see `win_probability_table()`.
+`battle_batch()` is still available for Monte Carlo estimates.
 
 ⚔️ RISK Combat Basics (the manual dice roll)
     - Attacker can roll up to 3 dice, but only if they have at least 4 troops (must leave 1 behind).
@@ -18,8 +18,21 @@ Expected performance issues when calculating battles involving high amounts of t
 """
 
 
+import itertools
+import random
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError: # numba is optional, kernels just run as plain Python without it.
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+    prange = range
+
 def battle(a, d):
     """
     Simulates a full battle in according with RISK True Random settings.
@@ -31,25 +44,293 @@ def battle(a, d):
     Returns:    
         (int, int): The total remaining troops on both sides.
     """
+    return _battle_kernel(a, d)
+
+
+def seed_rngs(seed):
+    """
+    Seeds every RNG a game draws from: Python's `random`, NumPy's global RNG, and the separate RNG
+    used inside compiled Numba kernels (which `random.seed()` does not reach).
+
+    Args:
+        seed (int): Seed value
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    _seed_kernel(seed)
+
+
+@njit
+def _seed_kernel(seed):
+    random.seed(seed)
+
+
+def _top_two(dice):
+    """
+    Returns the highest and second highest of up to 3 dice with plain compares, instead of sorting them.
+    A missing or unrolled die (0) never beats a rolled one.
+    """
+    first = second = 0
+    for die in dice:
+        if die > first:
+            first, second = die, first
+        elif die > second:
+            second = die
+    return first, second
+
+
+def _roll_losses(att_roll, def_roll):
+    """
+    Compares one roll of dice. Unrolled dice are 0, and a pair is only compared if both dice were rolled.
+
+    Args:
+        att_roll (tuple[int]): Attacker dice (up to 3)
+        def_roll (tuple[int]): Defender dice (up to 2)
+
+    Returns:
+        (int, int): Attacker losses and defender losses.
+    """
+    a1, a2 = _top_two(att_roll)
+    d1, d2 = _top_two(def_roll)
+    a_loss = d_loss = 0
+    for a_die, d_die in ((a1, d1), (a2, d2)):
+        if a_die == 0 or d_die == 0:
+            break
+        if a_die > d_die:
+            d_loss += 1
+        else:
+            a_loss += 1
+    return a_loss, d_loss
+
+
+def _round_outcome_cdf(atk_dice, def_dice):
+    """
+    Computes the exact outcome distribution of a single round of dice by enumerating every roll.
+
+    Args:
+        atk_dice (int): Number of dice the attacker rolls (1-3)
+        def_dice (int): Number of dice the defender rolls (1-2)
+
+    Returns:
+        tuple: 3 entries of (cumulative probability, attacker losses, defender losses), ordered by losses.
+            Rounds comparing only one pair of dice have 2 outcomes, padded with a (1.0, 0, 0) entry that is never drawn.
+    """
+    counts = {}
+    for roll in itertools.product(range(1, 7), repeat=atk_dice + def_dice):
+        a_loss, d_loss = _roll_losses(roll[:atk_dice], roll[atk_dice:])
+        counts[(a_loss, d_loss)] = counts.get((a_loss, d_loss), 0) + 1
+
+    total = 6 ** (atk_dice + def_dice)
+    cdf = []
+    cum = 0
+    for (a_loss, d_loss), count in sorted(counts.items()):
+        cum += count
+        cdf.append((cum / total, a_loss, d_loss))
+    while len(cdf) < 3:
+        cdf.append((1.0, 0, 0))
+    return tuple(cdf)
+
+# Indexed as _ROUND_CDF[atk_dice - 1][def_dice - 1]. Tuples so the kernel can use it as a compile-time constant.
+_ROUND_CDF = tuple(tuple(_round_outcome_cdf(atk_dice, def_dice) for def_dice in (1, 2)) for atk_dice in (1, 2, 3))
+
+
+@njit(cache=True)
+def _battle_kernel(a, d):
+    """
+    Compiled loop behind `battle()`. Instead of rolling and sorting dice, each round draws
+    one uniform number and looks up its (attacker losses, defender losses) in `_ROUND_CDF`.
+    """
     while a > 0 and d > 0:
-        # Attacker rolls 3 dice (while they have 3+ troops)
-        atk_dice = min(3, a) 
-        # Defender rolls 2 dice (while they have 2+ troops)
-        def_dice = min(2, d)
-
-        att_rolls = np.random.randint(1, 7, size=atk_dice)
-        def_rolls = np.random.randint(1, 7, size=def_dice)
-
-        # Sort rolls by descending
-        att_top = np.sort(att_rolls)[::-1]
-        def_top = np.sort(def_rolls)[::-1]
-
-        # Compare best dice pairs, lesser side loses one troop.
-        for i in range(min(atk_dice, def_dice)):
-            # If dice are a tie, defender wins.
-            if att_top[i] > def_top[i]: 
-                d -= 1
-            else:
-                a -= 1
-
-    return a, d
\ No newline at end of file
+        # Attacker rolls 3 dice (while they have 3+ troops), defender rolls 2 dice (while they have 2+ troops)
+        outcomes = _ROUND_CDF[min(a, 3) - 1][min(d, 2) - 1]
+        u = random.random()
+        for cum, a_loss, d_loss in outcomes:
+            if u < cum:
+                a -= a_loss
+                d -= d_loss
+                break
+
+    return a, d
+
+
+def battle_many(attackers, defenders):
+    """
+    Simulates many independent battles, each with its own troop counts (e.g. one per simulated game).
+    Same rules as `battle()`. With Numba, the battles are spread over all cores.
+
+    Args:
+        attackers (array-like of int): Number of attackers of each battle
+        defenders (array-like of int): Number of defenders of each battle
+
+    Returns:
+        (np.ndarray, np.ndarray): Remaining attackers and defenders of each battle (int64 arrays).
+    """
+    return _battle_many_kernel(np.asarray(attackers, dtype=np.int64), np.asarray(defenders, dtype=np.int64))
+
+
+@njit(cache=True, parallel=True)
+def _battle_many_kernel(attackers, defenders):
+    """Compiled loop behind `battle_many()`. Each thread draws from its own Numba RNG state."""
+    n = attackers.shape[0]
+    a_out = np.empty(n, dtype=np.int64)
+    d_out = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        a_out[i], d_out[i] = _battle_kernel(attackers[i], defenders[i])
+    return a_out, d_out
+
+
+def count_wins(a, d, n):
+    """
+    Simulates n battles of a attackers vs. d defenders in compiled code and counts the attacker's wins.
+    For Monte Carlo estimates this skips building the per-battle result arrays of `battle_batch()`.
+    Without Numba the compiled loop would run as plain Python, so this falls back to `battle_batch()`.
+
+    Args:
+        a (int): Number of attackers
+        d (int): Number of defenders
+        n (int): Number of battles to simulate
+
+    Returns:
+        int: Number of battles in which the defenders were wiped out.
+    """
+    if NUMBA_AVAILABLE:
+        return _count_wins_kernel(a, d, n)
+    _, defenders = battle_batch(a, d, n)
+    return int(np.count_nonzero(defenders == 0))
+
+
+@njit(cache=True, parallel=True)
+def _count_wins_kernel(a, d, n):
+    """Compiled loop behind `count_wins()`. Battles are spread over all cores with prange."""
+    wins = 0
+    for _ in prange(n):
+        if _battle_kernel(a, d)[1] == 0:
+            wins += 1
+    return wins
+
+
+# DP table behind `win_probability()`, grown on demand. Each cell only depends on smaller cells,
+# so a bigger table holds the same values.
+_win_probability_cache = None
+
+def win_probability(a, d):
+    """
+    Computes the exact probability that a attackers win against d defenders (see `win_probability_table()`).
+    The DP table is kept between calls and only rebuilt (at least doubling in size) when (a, d) falls outside it,
+    so repeated lookups are O(1).
+
+    Args:
+        a (int): Number of attackers
+        d (int): Number of defenders
+
+    Returns:
+        float: Probability that the defenders are wiped out.
+    """
+    global _win_probability_cache
+    table = _win_probability_cache
+    if table is None or a >= table.shape[0] or d >= table.shape[1]:
+        rows, cols = (0, 0) if table is None else table.shape
+        table = _win_probability_cache = _win_probability_table(max(a, 2 * rows), max(d, 2 * cols))
+    return float(table[a, d])
+
+
+def win_probability_table(a_max, d_max):
+    """
+    Computes the exact win probability of every battle up to a_max attackers vs. d_max defenders.
+
+    Each round moves the battle from (a, d) to (a - attacker losses, d - defender losses) with the fixed
+    probabilities of `_ROUND_CDF`, so P[a, d] = sum of p * P[a - a_loss, d - d_loss] over the round's outcomes,
+    starting from P[a, 0] = 1 and P[0, d] = 0. Every cell is computed once, in O(a_max * d_max).
+
+    Args:
+        a_max (int): Largest number of attackers
+        d_max (int): Largest number of defenders
+
+    Returns:
+        np.ndarray: float64 array of shape (a_max + 1, d_max + 1), indexed by attackers (rows) and defenders (columns).
+    """
+    return _win_probability_table(a_max, d_max)
+
+
+@njit(cache=True)
+def _win_probability_table(a_max, d_max):
+    """Compiled DP behind `win_probability_table()`."""
+    P = np.zeros((a_max + 1, d_max + 1))
+    P[1:, 0] = 1.0
+    for a in range(1, a_max + 1):
+        for d in range(1, d_max + 1):
+            outcomes = _ROUND_CDF[min(a, 3) - 1][min(d, 2) - 1]
+            p = 0.0
+            prev = 0.0
+            for cum, a_loss, d_loss in outcomes:
+                # Padding outcomes have zero probability, so they add nothing.
+                p += (cum - prev) * P[a - a_loss, d - d_loss]
+                prev = cum
+            P[a, d] = p
+
+    return P
+
+
+def _roll_losses_table():
+    """
+    Computes the losses of every possible roll of 3 attacker and 2 defender dice, where unused dice are 0.
+
+    Returns:
+        np.ndarray: int8 array indexed by the 5 dice packed 3 bits each (see `_DICE_PACKING`),
+            holding (attacker losses << 2) | defender losses.
+    """
+    table = np.zeros(1 << 15, dtype=np.int8)
+    for roll in itertools.product(range(7), repeat=5):
+        a_loss, d_loss = _roll_losses(roll[:3], roll[3:])
+        key = sum(die << (3 * i) for i, die in enumerate(roll))
+        table[key] = (a_loss << 2) | d_loss
+    return table
+
+# Packs a row of 5 dice into a `_ROLL_LOSSES` index with one matrix product.
+_DICE_PACKING = np.array([1 << (3 * i) for i in range(5)], dtype=np.int16)
+_ROLL_LOSSES = _roll_losses_table()
+
+
+def battle_batch(a, d, n):
+    """
+    Simulates n independent battles of a attackers vs. d defenders at once.
+
+    Same rules as `battle()`, but every still-running battle rolls its dice in one NumPy call per round,
+    so the Python loop runs once per round (at most a + d times) instead of once per round per battle.
+    Sides always roll 3 and 2 dice; dice a side is not allowed to roll are zeroed out,
+    and each round's losses are read from `_ROLL_LOSSES`.
+
+    Args:
+        a (int): Number of attackers
+        d (int): Number of defenders
+        n (int): Number of battles to simulate
+
+    Returns:
+        (np.ndarray, np.ndarray): Remaining attackers and defenders of each battle (int16 arrays of length n).
+    """
+    attackers = np.full(n, a, dtype=np.int16)
+    defenders = np.full(n, d, dtype=np.int16)
+    active = np.arange(n)
+
+    while active.size:
+        a_cur = attackers[active]
+        d_cur = defenders[active]
+
+        # One RNG call per round for all 5 dice, split into attacker and defender views
+        rolls = np.random.randint(1, 7, size=(active.size, 5), dtype=np.int8)
+        att_rolls = rolls[:, :3]
+        def_rolls = rolls[:, 3:]
+        att_rolls *= np.minimum(3, a_cur)[:, None] > np.arange(3)
+        def_rolls *= np.minimum(2, d_cur)[:, None] > np.arange(2)
+
+        # Look up the losses of each packed roll instead of sorting and comparing dice
+        key = rolls.astype(np.int16) @ _DICE_PACKING
+        code = _ROLL_LOSSES[key]
+        a_loss = code >> 2
+        d_loss = code & 3
+
+        attackers[active] = a_cur - a_loss
+        defenders[active] = d_cur - d_loss
+        active = active[(attackers[active] > 0) & (defenders[active] > 0)]
+
+    return attackers, defenders
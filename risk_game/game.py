@@ -24,7 +24,13 @@ Usage:
 
 from structures import Card
 from combat import battle
-import random
+from collections import deque
+import itertools
+import numpy as np
+
+CARD_TYPES = ("Infantry", "Cavalry", "Artillery")  # Jokers are only added on reshuffle
+STARTING_ARMIES = (0, 0, 40, 35, 30, 25, 20)  # Indexed by # of players
+FIRST_TURN_EXTRAS = (0, 0, 0, 1, 2, 3)  # Extra first-turn troops, indexed by seat
 
 class GameState:
     """
@@ -37,13 +43,17 @@ class GameState:
         players (list of Player): List of players currently in the game.
         round (int): Current round number.
         current_player_index (int): Index of the player whose turn it is.
-        game_log (list of str): Chronological list of game event messages.
-        game_log_index (int): Tracks how many log entries have been retrieved so far.
-        deck (list of Card): Current deck of cards to draw from.
+        game_log (list of str): Chronological list of game event messages. Stays empty when log_sink is given.
+        logging_enabled (bool): If False, log_event() is a no-op and Game skips building log messages.
+            Useful for headless bot games where nobody reads the log.
+        printing_enabled (bool): If False, log_event() still writes to log_sink but never prints, and keeps no
+            new entries for get_log(). Useful when the log only goes to a file.
+        deck (deque of Card): Current deck of cards to draw from, top card first.
         discard (list of Card): Discard pile of used cards.
+        rng (np.random.Generator): Random generator for deck shuffles and starting territories/armies.
     """
 
-    def __init__(self, territories, continents, players=None):
+    def __init__(self, territories, continents, players=None, log_sink=None, seed=None):
         """
         Initializes the GameState with game map data, players, and combat system.
 
@@ -52,6 +62,9 @@ class GameState:
             continents (list of Continent): List of Continent objects in the game.
             players (list of Player, optional): List of Player objects participating.
                 Defaults to an empty list if not provided.
+            log_sink (callable, optional): Called with each log entry instead of appending it to game_log,
+                e.g. to stream the log into a file as the game runs. Defaults to game_log.append.
+            seed (int, optional): Seed for rng. Defaults to fresh OS entropy.
         """
         self.territories = territories
         self.continents = continents
@@ -59,20 +72,29 @@ class GameState:
         self.round = 0
         self.current_player_index = 0
         self.game_log = []
-        self.game_log_index = 0
-        self.deck = []
+        self._sink = log_sink if log_sink else self.game_log.append
+        self._pending = deque()  # Log entries not yet retrieved by get_log()
+        self.logging_enabled = True
+        self.printing_enabled = True
+        self.deck = deque()
         self.discard = []
+        self.rng = np.random.default_rng(seed)
 
     def log_event(self, event_str, doPrint=False):
         """
-        Adds an event string to the game log. Optionally prints the updated log.
+        Adds an event string to the game log (or passes it to log_sink). Optionally prints the updated log.
 
         Args:
             event_str (str): Description of the event to add to the log.
             doPrint (bool, optional): If True, prints all new log entries after adding this event.
                 Defaults to False.
         """
-        self.game_log.append(event_str)
+        if not self.logging_enabled:
+            return
+        self._sink(event_str)
+        if not self.printing_enabled:
+            return
+        self._pending.append(event_str)
         if doPrint:
             for line in self.get_log():
                 print(line)
@@ -82,18 +104,18 @@ class GameState:
         Retrieves entries from the game log.
 
         Args:
-            full (bool, optional): If True, returns the entire log.
+            full (bool, optional): If True, returns the entire log (empty if it goes to a log_sink).
                 If False (default), returns only new entries since last retrieval.
 
         Returns:
             list of str: The requested log entries.
         """
         if full:
-            self.game_log_index = len(self.game_log)
+            self._pending.clear()
             return self.game_log
         else:
-            out = self.game_log[self.game_log_index:]
-            self.game_log_index = len(self.game_log)
+            out = list(self._pending)
+            self._pending.clear()
             return out
 
     def current_player(self):
@@ -117,7 +139,7 @@ class Game:
             def next_round() ... # Start the next round (called indefinitely until game end)
                 def start_turn() ... # Complete a player's turn (iterated through each player during round)
                     def trade_and_draft() ... # Helper function called during draft phase (& attack phase on kill)
-                    def give_territory() ... # Transfer ownership of territory. Also used in assign_starting_territories() 
+                    def give_territory() ... # Transfer ownership of territory after a capture.
                     def eliminate_player ...  # Check if player has no territories, remove them if true.
                     def check_win_condition() ... # Check if anyone won, prepare to end game
                     def draw_card() ... # Get top card from deck
@@ -143,12 +165,11 @@ class Game:
         Builds a shuffled deck of cards of random types. One for each territory.
         Note: Jokers are only introduced on reshuffle_deck()
         """
-        card_types = ["Infantry", "Cavalry", "Artillery"]
-        cards = []
-        for terr in self.state.territories:
-            cards.append(Card(random.choice(card_types), terr))
-        random.shuffle(cards)
-        self.state.deck = cards
+        # Draw every card's type in one call. Indexing CARD_TYPES keeps the types plain strings.
+        type_ids = self.state.rng.integers(len(CARD_TYPES), size=len(self.state.territories))
+        cards = [Card(CARD_TYPES[i], terr) for i, terr in zip(type_ids, self.state.territories)]
+        self.state.rng.shuffle(cards)
+        self.state.deck = deque(cards)
 
     def assign_starting_territories(self):
         """
@@ -156,27 +177,26 @@ class Game:
         
         Each player gets # of territories X equal to (total # of territories // # of players).
         For Y remainder territories, the first Y players get 1 additional territory, for a total of (X+1) territories.
-        """
-        all_territories = self.state.territories.copy()
-        random.shuffle(all_territories)
-
-        players = self.state.players
-        num_players = len(players)
-        territories_per_player = len(all_territories) // num_players
-        remainder = len(all_territories) % num_players
 
-        assignment_counts = [territories_per_player] * num_players
-        for i in range(remainder):
-            assignment_counts[i] += 1 
+        Territories start unowned, so ownership is set directly instead of through give_territory(),
+        and enemy_neighbor_count is computed once after everything is assigned.
+        """
+        all_territories = self.state.territories
+        order = self.state.rng.permutation(len(all_territories))
 
-        idx = 0
-        for player_index, count in enumerate(assignment_counts):
-            for _ in range(count):
+        # array_split gives the first (# of territories % # of players) chunks one extra territory.
+        for player, chunk in zip(self.state.players, np.array_split(order, len(self.state.players))):
+            for idx in chunk:
                 territory = all_territories[idx]
-                player = players[player_index]
-                self.give_territory(territory, player)
-                self.state.log_event(f"[GAME] {player.name} received {territory.name}.")
-                idx += 1 
+                territory.owner = player
+                territory.owner_index = len(player.territories)
+                player.territories.append(territory)
+                player.territory_mask |= territory.bit
+                if self.state.logging_enabled:
+                    self.state.log_event(f"[GAME] {player.name} received {territory.name}.")
+
+        for territory in all_territories:
+            territory.enemy_neighbor_count = bin(territory.neighbor_mask & ~territory.owner.territory_mask).count("1")
 
     def assign_starting_armies(self):
         """
@@ -191,9 +211,7 @@ class Game:
 
         Note that each terrority must contain at least 1 troop, which we account for in give_territory()
         """
-        num_players = len(self.state.players)
-        counts = [0,0,40,35,30,25,20]
-        start_army_count = counts[num_players]
+        start_army_count = STARTING_ARMIES[len(self.state.players)]
 
         for player in self.state.players:
             # Set all territories to 1 troop initially
@@ -206,17 +224,20 @@ class Game:
                 # Defensive: if territories > start armies, adjust (should never happen)
                 remaining = 0
 
-            # Distribute remaining troops randomly
-            for _ in range(remaining):
-                random.choice(player.territories).armies += 1
+            # Distribute remaining troops randomly, drawing every territory's share at once
+            k = len(player.territories)
+            extras = self.state.rng.multinomial(remaining, np.full(k, 1 / k))
+            for terr, extra in zip(player.territories, extras):
+                terr.armies += int(extra)
 
             player.update_army_count()
 
     def next_round(self):
         """Advances the game to the next round (iterate through each player's turn)."""
-        info = [str(t) for t in self.state.territories] + [str(p) for p in self.state.players]
-        info_str = '\n[INFO] ' + '\n[INFO] '.join(info)
-        self.state.log_event(info_str, True)
+        if self.state.logging_enabled:
+            info = itertools.chain(map(str, self.state.territories), map(str, self.state.players))
+            info_str = '\n[INFO] ' + '\n[INFO] '.join(info)
+            self.state.log_event(info_str, True)
         self.state.round += 1
         i = 0
         while self.running and i < len(self.state.players):
@@ -232,97 +253,100 @@ class Game:
         """
 
         curr_player = self.state.current_player()
-        self.state.log_event(f"\n--- Round {self.state.round}: {curr_player.name}'s turn ---")
+        # Hoisted out of the attack/fortify loops.
+        name = curr_player.name
+        log = self.state.log_event
+        logging_enabled = self.state.logging_enabled
+        if logging_enabled:
+            log(f"\n--- Round {self.state.round}: {name}'s turn ---")
 
         # Update current player's owned continents list
         owned_continents = []
         for continent in self.state.continents:
-            if all(t.owner == curr_player for t in continent.territories):
+            if not continent.mask & ~curr_player.territory_mask:
                 continent.owner = curr_player  # Update continent owner
                 owned_continents.append(continent)
             else:
                 # Remove owner if previously owned but lost
-                if continent.owner == curr_player:
+                if continent.owner is curr_player:
                     continent.owner = None
 
         curr_player.continents = owned_continents  # Update player's owned continents attribute
         
         # Draft phase
         # Special first turn logic
-        extras = [0,0,0,1,2,3]
         i = 0
         if self.state.round == 1:
             i = self.state.players.index(curr_player)
-        self.state.log_event(f"[DRAFT] {curr_player.name} received {curr_player.update_aatd_count(extras[i])} troops with {len(curr_player.territories)} territories.", True)
+        income = curr_player.update_aatd_count(FIRST_TURN_EXTRAS[i])
+        if logging_enabled:
+            log(f"[DRAFT] {name} received {income} troops with {len(curr_player.territories)} territories.", True)
         self.trade_and_draft(curr_player)
 
-        # Attack phase
+        # Attack phase: attack() returns None to end it.
         capture_success = False
         while True:
-            try:
-                attack_result = curr_player.attack()
-                if attack_result is None:
-                    self.state.log_event(f"[ATTACK] {curr_player.name} ended the attack phase.")
-                    break
-
-                atk_terr, def_terr, amount = attack_result
-                self.state.log_event(f"[ATTACK] {curr_player.name} attacked {def_terr} from {atk_terr} with {amount} troops.")
-                
-                # Replace the territory army counts with the results of the battle.
-                atk_res, def_res = battle(amount, def_terr.armies)
-                self.state.log_event(f"[ATTACK] Lost troops: {atk_terr.armies-atk_res-1} | {def_terr.armies-def_res}")
-                self.state.log_event(f"[ATTACK] Remaining troops: {atk_res+1} | {def_res}", True)
-                atk_terr.armies = atk_res+1
-                def_terr.armies = def_res
-
-                # If defender lost all troops, territory changes ownership
-                if def_terr.armies == 0:
-                    capture_success = True
-                    def_player = def_terr.owner
-                    self.give_territory(def_terr, curr_player)
-
-                    # Eliminate defending player if they lost their last territory.
-                    self.eliminate_player(player=def_player, winner=curr_player)
-                    if self.check_win_condition(): return
-                    
-                    # On kill, player may now have 5+ cards. We force trade-ins here.
-                    while len(curr_player.cards) >= 5:
-                        self.trade_and_draft(curr_player)
-
-                    # Move in troops.
-                    amount = curr_player.fortify(from_territory = atk_terr, dest_territory = def_terr)
-                    curr_player.move_troops(from_territory = atk_terr, dest_territory = def_terr, amt = amount)
-
-                    self.state.log_event(f"[ATTACK] {curr_player.name} captured {def_terr.name} and moved in {amount} troops!")
-
-            except Exception as e:
-                self.state.log_event(f"[ERROR] {e}")
+            attack_result = curr_player.attack()
+            if attack_result is None:
+                if logging_enabled:
+                    log(f"[ATTACK] {name} ended the attack phase.")
                 break
 
-        # Fortify phase
-        while True:
-            try:
-                result = curr_player.fortify()
-                if result is None:
-                    self.state.log_event(f"[FORTIFY] {curr_player.name} skipped the fortify phase.")
-                    break
-                else:
-                    from_terr, dest_terr, amount = result
-                    curr_player.move_troops(from_terr, dest_terr, amount)
-                    self.state.log_event(f"[FORTIFY] {curr_player.name} fortified {amount} troops from {from_terr} to {dest_terr}.")
-                    break
-
-            except Exception as e:
-                self.state.log_event(f"[ERROR] {e}")
-                break    
+            atk_terr, def_terr, amount = attack_result
+            if logging_enabled:
+                log(f"[ATTACK] {name} attacked {def_terr} from {atk_terr} with {amount} troops.")
+            
+            # Replace the territory army counts with the results of the battle.
+            atk_res, def_res = battle(amount, def_terr.armies)
+            if logging_enabled:
+                log(f"[ATTACK] Lost troops: {atk_terr.armies-atk_res-1} | {def_terr.armies-def_res}")
+                log(f"[ATTACK] Remaining troops: {atk_res+1} | {def_res}", True)
+            # Keep both players' army totals current with the battle losses.
+            curr_player.armies -= atk_terr.armies - atk_res - 1
+            def_terr.owner.armies -= def_terr.armies - def_res
+            atk_terr.armies = atk_res+1
+            def_terr.armies = def_res
+
+            # If defender lost all troops, territory changes ownership
+            if def_terr.armies == 0:
+                capture_success = True
+                def_player = def_terr.owner
+                self.give_territory(def_terr, curr_player)
+
+                # Eliminate defending player if they lost their last territory.
+                self.eliminate_player(player=def_player, winner=curr_player)
+                if self.check_win_condition(): return
+                
+                # On kill, player may now have 5+ cards. We force trade-ins here.
+                while len(curr_player.cards) >= 5:
+                    self.trade_and_draft(curr_player)
+
+                # Move in troops.
+                amount = curr_player.fortify(from_territory = atk_terr, dest_territory = def_terr)
+                curr_player.move_troops(from_territory = atk_terr, dest_territory = def_terr, amt = amount)
+
+                if logging_enabled:
+                    log(f"[ATTACK] {name} captured {def_terr.name} and moved in {amount} troops!")
+
+        # Fortify phase: fortify() returns None to skip it.
+        result = curr_player.fortify()
+        if result is None:
+            if logging_enabled:
+                log(f"[FORTIFY] {name} skipped the fortify phase.")
+        else:
+            from_terr, dest_terr, amount = result
+            curr_player.move_troops(from_terr, dest_terr, amount)
+            if logging_enabled:
+                log(f"[FORTIFY] {name} fortified {amount} troops from {from_terr} to {dest_terr}.")
 
         # End turn
-        curr_player.update_army_count()
         if capture_success:
             new_card = self.draw_card()
             curr_player.cards.append(new_card)
-            self.state.log_event(f"[GAME] {curr_player.name} received a card: {new_card}.")
-        self.state.log_event(f"[END] {curr_player}", True)
+            if logging_enabled:
+                log(f"[GAME] {name} received a card: {new_card}.")
+        if logging_enabled:
+            log(f"[END] {curr_player}", True)
 
     def trade_and_draft(self, curr_player): 
         """Helper function for start_turn()."""
@@ -330,38 +354,58 @@ class Game:
         if chosen_set: # On trade-in, discard cards and add bonus troops
             bonus = curr_player.trade_in_cards(chosen_set)
             self.state.discard.extend(chosen_set)
-            self.state.log_event(f"[DRAFT] {curr_player.name} traded in cards for {bonus} bonus troops.", True)
+            if self.state.logging_enabled:
+                self.state.log_event(f"[DRAFT] {curr_player.name} traded in cards for {bonus} bonus troops.", True)
         while curr_player.aatd > 0: # Draft all available troops
             terr, amt = curr_player.draft()
             terr.armies += amt
+            curr_player.armies += amt
             curr_player.aatd -= amt
-            self.state.log_event(f"[DRAFT] {curr_player.name} placed {amt} troops in {terr}.")
+            if self.state.logging_enabled:
+                self.state.log_event(f"[DRAFT] {curr_player.name} placed {amt} troops in {terr}.")
 
     def give_territory(self, territory, player):
         """
         Transfers ownership of a territory to a player.
-        Used at start of game to distribute territories,
-        and after a successful attack -> capture of territory.
+        Used after a successful attack -> capture of territory.
+        Also updates enemy_neighbor_count of the territory and every territory that neighbors it.
         """
+        old_owner = territory.owner
+        for other in territory.neighbor_of:
+            if other.owner is old_owner:
+                other.enemy_neighbor_count += 1
+            if other.owner is player:
+                other.enemy_neighbor_count -= 1
+
         if territory.owner: 
-            territory.owner.territories.remove(territory)
+            # Swap the last territory into this one's slot, so removal doesn't scan the list.
+            owned = territory.owner.territories
+            last = owned.pop()
+            if last is not territory:
+                owned[territory.owner_index] = last
+                last.owner_index = territory.owner_index
+            territory.owner.territory_mask &= ~territory.bit
+        territory.owner_index = len(player.territories)
         player.territories.append(territory)
+        player.territory_mask |= territory.bit
         territory.owner = player
         territory.armies = 0
+        territory.enemy_neighbor_count = bin(territory.neighbor_mask & ~player.territory_mask).count("1")
 
     def eliminate_player(self, player, winner):
         """
         Removes a player from the game when they have no territories left.
         Transfers that player's cards to winner, the player who killed them.
         """
-        if player.territories == []:
+        if not player.territories:
             killed_index = self.state.players.index(player)
             num_cards = len(player.cards)
             winner.cards = winner.cards + player.cards
             player.cards = []
 
-            self.state.log_event(f"[GAME] {winner.name} defeated {player.name}, gaining {num_cards} cards.", True)
-            self.state.players.remove(player)
+            if self.state.logging_enabled:
+                self.state.log_event(f"[GAME] {winner.name} defeated {player.name}, gaining {num_cards} cards.", True)
+            self.state.players.pop(killed_index)
 
             # Adjust current player index if needed
             if killed_index < self.state.current_player_index:
@@ -374,7 +418,8 @@ class Game:
         """
         # Win condition #1, the standard for world domination gamemode. We may add more later.
         if len(self.state.players) == 1:
-            self.state.log_event(f"[GAME] {self.state.players[0].name} wins the game!", True)
+            if self.state.logging_enabled:
+                self.state.log_event(f"[GAME] {self.state.players[0].name} wins the game!", True)
             self.running = False
             return True
         return False
@@ -386,7 +431,7 @@ class Game:
         """
         if not self.state.deck:
             self.reshuffle_deck()
-        card = self.state.deck.pop(0)
+        card = self.state.deck.popleft()
         return card
 
     def reshuffle_deck(self):
@@ -395,9 +440,10 @@ class Game:
         Clears the discard pile after reshuffle.
         """
         jokers = [Card("Joker", None), Card("Joker", None)]
-        self.state.deck = self.state.discard + jokers
+        cards = self.state.discard + jokers
+        self.state.rng.shuffle(cards)
+        self.state.deck = deque(cards)
         self.state.discard.clear()
-        random.shuffle(self.state.deck)
 
 
 
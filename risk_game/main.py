@@ -6,70 +6,125 @@ Entry point for launching a game of RISK.
 - Loads map data from a JSON file (maploader.py)
 - Initializes players and game state (game.py), bots included (bots.py)
 - Starts the game and prints the game log.
-- On game end, writes full log to text file.
+- Streams the game log to a text file while the game runs.
+- play_many() runs many seeded games in parallel worker processes.
 
 Intended as a script for testing or demo purposes.
 """
 
 from game import Game, GameState
-from maploader import load_map
+from maploader import load_map, GAME_MAP_PATH
+from combat import seed_rngs
 from bots import *
+from functools import partial
+from multiprocessing import Pool
 import random, os
 
 
 """
 Initialization settings:
 
-Right now we only have the Classic map and True Random settings.
+Right now we only have the Classic map (GAME_MAP_PATH, see maploader.py) and True Random settings.
 
-Feel free to edit players[]. Our options for Player classes are as follows:
- - Player: YOU get to play, interacting with user terminal.
+Feel free to edit make_players(). Our options for Player classes are as follows:
+ - Player: YOU get to play, interacting with user terminal. (Not with play_many(), workers have no terminal.)
  - Neutral_Bot: Bot that never attacks
  - Aggro1_Bot: Bot that puts up a fight (see bots.py for algorithm)
 """
-GAME_MAP_PATH = "map_data/classic.json"
-players = [
-    Aggro1_Bot(name="P1"),
-    Aggro1_Bot(name="P2"),
-    Aggro1_Bot(name="P3"),
-    Aggro1_Bot(name="P5"),
-    Aggro1_Bot(name='P5'),
-    Aggro1_Bot(name="P6")
-]
-
-def play_game():
+def make_players():
+    """Builds a fresh set of players for one game, so every game (and every worker process) has its own."""
+    return [
+        Aggro1_Bot(name="P1"),
+        Aggro1_Bot(name="P2"),
+        Aggro1_Bot(name="P3"),
+        Aggro1_Bot(name="P5"),
+        Aggro1_Bot(name='P5'),
+        Aggro1_Bot(name="P6")
+    ]
+
+def play_game(seed=None, log_dir="game_logs", log_name=None, print_log=True):
     """
     Sets up and starts a game of RISK.
 
+    - Seeds all RNGs if a seed is given, so the game can be replayed.
     - Shuffles player order.
     - Loads map data.
-    - Creates GameState and Game instances.
+    - Picks the log file in log_dir: log_name if given, otherwise the next free number (see _open_next_log()).
+    - Creates GameState and Game instances, streaming the game log into that file as the game runs.
     - Runs the game startup (and completion) logic.
-    - Writes the game log to txt file after initialization.
+
+    Args:
+        seed (int, optional): Seed for every RNG the game uses (see combat.seed_rngs()).
+        log_dir (str): Directory to write the game log to.
+        log_name (str, optional): Log file name without extension.
+        print_log (bool): Also print the log to the terminal as the game runs (see GameState.printing_enabled).
+
+    Returns:
+        str: Name of the winning player.
     """
+    if seed is not None:
+        seed_rngs(seed)
+    players = make_players()
     random.shuffle(players)
     territories, continents = load_map(GAME_MAP_PATH)
-    game_state = GameState(territories, continents, players)
-    game = Game(game_state)
-    game.start()
 
-    # Ensure game_logs directory exists
-    os.makedirs("game_logs", exist_ok=True)
+    # Ensure log directory exists
+    os.makedirs(log_dir, exist_ok=True)
+
+    if log_name is None:
+        log_file = _open_next_log(log_dir)
+    else:
+        log_file = open(os.path.join(log_dir, f"{log_name}.txt"), "w", encoding="utf-8")
+    with log_file:
+        game_state = GameState(territories, continents, players, log_sink=lambda line: log_file.write(line + "\n"), seed=seed)
+        game_state.printing_enabled = print_log
+        game = Game(game_state)
+        game.start()
 
+    return game_state.players[0].name
+
+def _open_next_log(log_dir):
+    """
+    Opens the next available numbered log file (1.txt, 2.txt, ...) in log_dir for writing.
+    The file is claimed with mode "x", so two games started at once can't both take the same number.
+    """
     # Find next available log filename
-    existing_files = [f for f in os.listdir("game_logs") if f.endswith(".txt")]
     existing_numbers = []
-    for f in existing_files:
-        try:
-            existing_numbers.append(int(os.path.splitext(f)[0]))
-        except ValueError:
-            pass
+    for f in os.listdir(log_dir):
+        if f.endswith(".txt"):
+            try:
+                existing_numbers.append(int(os.path.splitext(f)[0]))
+            except ValueError:
+                pass
     next_num = max(existing_numbers) + 1 if existing_numbers else 1
 
-    log_path = os.path.join("game_logs", f"{next_num}.txt")
-    with open(log_path, "w", encoding="utf-8") as log_file:
-        for line in game_state.get_log(full=True):
-            log_file.write(line + "\n")
+    while True:
+        try:
+            return open(os.path.join(log_dir, f"{next_num}.txt"), "x", encoding="utf-8")
+        except FileExistsError:
+            next_num += 1
+
+def _play_quiet(seed, log_dir):
+    """Worker for play_many(): plays one game named after its seed, without printing the log to the terminal."""
+    return play_game(seed=seed, log_dir=log_dir, log_name=f"seed_{seed}", print_log=False)
+
+def play_many(n_games, processes=None, first_seed=0, log_dir="game_logs"):
+    """
+    Plays n_games seeded games across a pool of worker processes, like simulate.simulate_games()
+    but with each game's log written to disk.
+
+    Args:
+        n_games (int): Number of games to play. Game i uses seed first_seed + i and logs to seed_<seed>.txt.
+        processes (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        first_seed (int): Seed of the first game.
+        log_dir (str): Directory to write the game logs to.
+
+    Returns:
+        list[str]: Winner of each game, in seed order.
+    """
+    seeds = range(first_seed, first_seed + n_games)
+    with Pool(processes or os.cpu_count()) as pool:
+        return pool.map(partial(_play_quiet, log_dir=log_dir), seeds)
 
 if __name__ == '__main__':
-    play_game()
\ No newline at end of file
+    play_game()
@@ -10,6 +10,9 @@ Functions:
 import json, os
 from structures import Territory, Continent
 
+# Default map, relative to this file. Shared by main.py and simulate.py.
+GAME_MAP_PATH = "map_data/classic.json"
+
 def load_map(path):
     """
     Loads map data from a JSON file and constructs Territory and Continent objects.
@@ -38,7 +41,7 @@ def load_map(path):
     Returns:
         tuple: (territories, continents)
             - territories (list[Territory]): List of Territory objects with neighbor references.
-            - continents (list[Continent]): List of Continent objects with linked territories.
+            - continents (list[Continent]): List of Continent objects with linked territories (as tuples).
     """
     base_dir = os.path.dirname(__file__)
     full_path = os.path.join(base_dir, path)
@@ -48,23 +51,29 @@ def load_map(path):
     territory_data = map_data["territories"]
     continent_data = map_data["continents"]
 
-    # Step 1: Create Territory objects with neighbor names (temporarily)
+    # Step 1: Create Territory objects with neighbor names (temporarily), each with an id and its bit in territory bitmasks
     territories = {}
-    for name, info in territory_data.items():
-        territories[name] = Territory(
+    for i, (name, info) in enumerate(territory_data.items()):
+        territory = Territory(
             name=name,
             continent=info["continent"],
             neighbors=info["neighbors"]
         )
+        territory.id = i
+        territory.bit = 1 << i
+        territories[name] = territory
 
-    # Step 2: Replace neighbor names with references to Territory objects
+    # Step 2: Replace neighbor names with references to Territory objects, and build neighbor bitmasks
     for territory in territories.values():
-        territory.neighbors = [territories[n_name] for n_name in territory.neighbors]
+        territory.neighbors = tuple(territories[n_name] for n_name in territory.neighbors)
+        for neighbor in territory.neighbors:
+            territory.neighbor_mask |= neighbor.bit
+            neighbor.neighbor_of.append(territory)
 
-    # Step 3: Create Continent objects with references to Territory objects
+    # Step 3: Create Continent objects with (fixed, so tuple) references to Territory objects
     continents = {}
     for name, info in continent_data.items():
-        continent_territories = [territories[t_name] for t_name in info["territories"]]
+        continent_territories = tuple(territories[t_name] for t_name in info["territories"])
         continents[name] = Continent(
             name=name,
             bonus=info["bonus"],
@@ -3,18 +3,19 @@ probability_table_generator.py
 
 Generates and saves a probability lookup table for RISK battles.
 
-- Uses Monte Carlo simulations (see ./notes/RISK_probability.ipynb for detailed explanation)
-- Fills a 2D NumPy array with estimated win probabilities, indexed by attackers (rows) and defenders (columns).
-- Saves table to disk after each new computation for resumable progress.
+- Computes exact win probabilities with `win_probability_table()` (combat.py), a DP over the (attackers, defenders) grid.
+- Fills a 2D NumPy array with win probabilities, indexed by attackers (rows) and defenders (columns).
+- Saves table to disk, replacing any existing table.
+- The Monte Carlo estimators (see ./notes/RISK_probability.ipynb for detailed explanation) are kept for cross-checking.
 """
 
 import numpy as np
 import os
-from combat import battle
+from combat import count_wins, win_probability_table
 
 def estimate_win_probability(a, d, n):
     """
-    Estimates the likelihood of winning an attack via Monte Carlo. Runs `battle()` for n repetitions, recording each simulated win.
+    Estimates the likelihood of winning an attack via Monte Carlo. Runs n battles at once with `count_wins()`, recording each simulated win.
     The probability estimate is equal to (# of wins / # of total reps).
 
     Args:
@@ -25,87 +26,65 @@ def estimate_win_probability(a, d, n):
     Returns: 
         float: The percentage value estimated probability of winning.
     """
-    wins = 0
-    for _ in range(n):
-        _, defenders = battle(a, d)
-        if defenders == 0:
-            wins += 1
-    return wins / n
+    return count_wins(a, d, n) / n
 
-def final_estimate_win_probability(a, d, verbose=False):
-    p0 = estimate_win_probability(a, d, 2400)
-    if p0 < 0.48:
-        p0 = p0 + 0.02
-    elif p0 > 0.52:
-        p0 = p0 - 0.02
-    else:
-        p0 = 0.5
-    n = int(154000 * p0 * (1 - p0))
-    if verbose:
-        print(f"Pilot p estimate: {round(p0, 4)}, n = {n}")
-    p = round(estimate_win_probability(a, d, n), 4)
-    if verbose:
-        print(f"0.5% error estimate for win probability: \nFor {a+1} attackers vs. {d} defenders: {p}%")
-    return p
-
-MAX_ATTACKERS = 1000
-MAX_DEFENDERS = 1000
-TABLE_FILE = "probability_table.npy"
-
-def load_or_create_table():
+def final_estimate_win_probability(a, d, verbose=False, half_width=0.005, batch_size=500, max_trials=200_000):
     """
-    Load an existing probability table from disk or create a new one.
+    Estimates the win probability to within +-half_width (95% confidence) via Monte Carlo.
+
+    Simulates batches of battles with `count_wins()` until the Wilson score interval around the running
+    estimate is narrower than half_width, so cells with p near 0 or 1 stop after a batch or two
+    instead of running a fixed number of battles.
 
-    If `TABLE_FILE` exists, loads the NumPy array from disk.
-    Otherwise, creates a new table filled with NaN to indicate 
-    uncomputed entries.
+    Args:
+        a (int): Number of attackers
+        d (int): Number of defenders
+        verbose (bool): Print the number of battles and the estimate.
+        half_width (float): Target half-width of the 95% confidence interval.
+        batch_size (int): Number of battles simulated between stopping checks.
+        max_trials (int): Upper bound on the number of battles.
 
     Returns:
-        np.ndarray: 2D NumPy array of shape (MAX_ATTACKERS + 1, MAX_DEFENDERS + 1) with dtype float32.
-                    Entries contain probabilities in percent, or NaN if not yet computed.
+        float: Estimated probability of winning, rounded to 4 decimals.
     """
+    z = 1.96
+    wins = trials = 0
+    while trials < max_trials:
+        wins += count_wins(a, d, batch_size)
+        trials += batch_size
+        p = wins / trials
+        wilson_half_width = z / (1 + z**2 / trials) * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2))
+        if wilson_half_width < half_width:
+            break
+    p = round(wins / trials, 4)
+    if verbose:
+        print(f"{trials} battles, {half_width*100}% error estimate for win probability: \nFor {a+1} attackers vs. {d} defenders: {p}")
+    return p
 
-    if os.path.exists(TABLE_FILE):
-        table = np.load(TABLE_FILE)
-        print("Loaded existing probability table.")
-    else:
-        # Use NaN to mark "uncomputed"
-        table = np.full((MAX_ATTACKERS + 1, MAX_DEFENDERS + 1), np.nan, dtype=np.float32)
-        print("Created new probability table.")
-    return table
+MAX_ATTACKERS = 1000
+MAX_DEFENDERS = 1000
+TABLE_FILE = "probability_table.npy"
 
 def save_table(table):
     """
     Save the probability table to disk as a `.npy` file.
 
+    Writes to a temporary file first and then swaps it in with `os.replace`, so an interrupted
+    save never leaves a half-written table behind.
+
     Args:
         table (np.ndarray): The probability table to save.
     """
-    np.save(TABLE_FILE, table)
+    tmp_file = TABLE_FILE + ".tmp"
+    with open(tmp_file, "wb") as f: # np.save would append ".npy" to a bare filename
+        np.save(f, table)
+    os.replace(tmp_file, TABLE_FILE)
     print("Table saved.")
 
 # ---- Main loop ----
-table = load_or_create_table()
-
-total_cells = MAX_ATTACKERS * MAX_DEFENDERS
-cells_done = np.count_nonzero(~np.isnan(table))
-
-for a in range(1, MAX_ATTACKERS + 1):
-    for d in range(1, MAX_DEFENDERS + 1):
-        if np.isnan(table[a, d]):  # Only compute missing entries
-            p = final_estimate_win_probability(a, d)
-            table[a, d] = p
-            cells_done += 1
-            progress = cells_done / total_cells * 100
-            print(f"[{cells_done}/{total_cells} | {progress:.2f}%] "
-                  f"Computed: attackers={a}, defenders={d}, win={p*100:.2f}%")
-            save_table(table)  # Save after each computation
-
-            # Optimization: if win% = 0, skip rest of row
-
-            if p == 0.0:
-                table[a, d+1:] = 0.0
-                cells_done += (MAX_DEFENDERS - d)
-                break
-
-
+if __name__ == '__main__':
+    # The exact DP rebuilds the whole table in milliseconds, so every entry is recomputed rather than
+    # resuming from (and mixing in) older Monte Carlo estimates already on disk.
+    print(f"Computing {(MAX_ATTACKERS + 1) * (MAX_DEFENDERS + 1)} entries.")
+    table = win_probability_table(MAX_ATTACKERS, MAX_DEFENDERS).astype(np.float32)
+    save_table(table)
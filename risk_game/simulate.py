@@ -0,0 +1,77 @@
+"""
+simulate.py
+
+Runs many headless bot-only games in parallel, for bot evaluation and Monte Carlo training.
+
+- Each game is built from scratch in a worker process with logging disabled (see GameState.logging_enabled),
+  and only a small summary is sent back, not the game log.
+- Games are independent, so they are spread over all cores with multiprocessing.Pool, sidestepping the GIL.
+
+Usage:
+    from bots import Aggro1_Bot
+    results = simulate_games(range(1000), [Aggro1_Bot] * 4)
+"""
+
+from functools import partial
+from multiprocessing import Pool
+import os
+
+from game import Game, GameState
+from maploader import load_map, GAME_MAP_PATH
+from combat import seed_rngs
+
+def simulate_game(seed, bot_classes, map_path=GAME_MAP_PATH):
+    """
+    Plays one full game between bots, without logging.
+
+    Args:
+        seed (int): Seed for every RNG the game uses, so the same seed replays the same game.
+        bot_classes (list[type]): One Player subclass per seat, in seating order. Players are named P1, P2, ...
+        map_path (str): Map to play on, relative to maploader.py.
+
+    Returns:
+        dict: Summary of the game with keys
+            seed (int): The given seed.
+            winner (str): Name of the winning player.
+            winner_seat (int): Index of the winner in bot_classes.
+            rounds (int): Number of rounds played.
+    """
+    seed_rngs(seed)
+    players = [bot_class(name=f"P{i+1}") for i, bot_class in enumerate(bot_classes)]
+    territories, continents = load_map(map_path)
+    game_state = GameState(territories, continents, list(players), seed=seed)
+    game_state.logging_enabled = False
+    game = Game(game_state)
+    game.start()
+
+    winner = game_state.players[0]
+    return {
+        "seed": seed,
+        "winner": winner.name,
+        "winner_seat": players.index(winner),
+        "rounds": game_state.round,
+    }
+
+def simulate_games(seeds, bot_classes, processes=None, chunksize=64):
+    """
+    Plays one game per seed across a pool of worker processes.
+
+    Args:
+        seeds (iterable[int]): Seeds of the games to play (see simulate_game()).
+        bot_classes (list[type]): One Player subclass per seat, in seating order.
+        processes (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        chunksize (int): Number of games handed to a worker at a time.
+
+    Returns:
+        list[dict]: Game summaries (see simulate_game()), in order of completion rather than seed order.
+    """
+    with Pool(processes or os.cpu_count()) as pool:
+        return list(pool.imap_unordered(partial(simulate_game, bot_classes=bot_classes), seeds, chunksize=chunksize))
+
+if __name__ == '__main__':
+    from collections import Counter
+    from bots import Aggro1_Bot
+
+    results = simulate_games(range(256), [Aggro1_Bot] * 4)
+    print(f"Wins per seat: {sorted(Counter(r['winner_seat'] for r in results).items())}")
+    print(f"Average rounds: {sum(r['rounds'] for r in results) / len(results):.1f}")
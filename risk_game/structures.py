@@ -8,6 +8,8 @@ Contains the classes for the main game data structures. They are integral to the
     - Territory
 """
 
+from collections import Counter, deque
+
 class Card:
     """
     Represents the card, which is traded in sets of 3 for bonus troops.
@@ -23,6 +25,8 @@ class Card:
             The first card in this order whose associated territory is also owned by the player also grants 2 additional troops
             which are automatically drafted to that territory.
     """
+    __slots__ = ("type", "territory")
+
     def __init__(self, type, territory=None):
         self.type = type
         self.territory = territory
@@ -42,14 +46,20 @@ class Continent:
     Attributes:
         name (str): Name of the continent.
         bonus (int): Size of the bonus armies
-        territories (list[Territory]): Territories that make up the continent.
+        territories (tuple[Territory]): Territories that make up the continent. Fixed once the map is loaded.
         owner (Player or None): Player who currently owns it.
+        mask (int): Bitmask of its territories' ids. A player p owns the continent iff `mask & ~p.territory_mask` is 0.
     """
+    __slots__ = ("name", "bonus", "territories", "owner", "mask")
+
     def __init__(self, name, bonus, territories):
         self.name = name
         self.bonus = bonus
         self.territories = territories
         self.owner = None
+        self.mask = 0
+        for territory in territories:
+            self.mask |= territory.bit
     
     def __str__(self):
         territory_names = ', '.join([t.name for t in self.territories])
@@ -67,14 +77,31 @@ class Territory:
         continent (str): Name of the continent it belongs to. Just for user clarification so can encode as String.
         owner (Player or None): Player who currently owns it.
         armies (int): Number of armies stationed. In practice, this number is always 1 or greater.
-        neighbors (list[Territory]): Adjacent territories that can be attacked/fortified through.
+        neighbors (tuple[Territory]): Adjacent territories that can be attacked/fortified through.
+        id (int): Index of the territory on its map, assigned by the map loader.
+        bit (int): `1 << id`, this territory's bit in a territory bitmask.
+        neighbor_mask (int): Bitmask of all neighbors' ids.
+        neighbor_of (list[Territory]): Territories that list this territory as a neighbor.
+            Not always the same as neighbors, since some map adjacencies only go one way.
+        enemy_neighbor_count (int): Number of neighbors with a different owner, i.e. the number of bits set in
+            `neighbor_mask & ~owner.territory_mask`. Kept up to date by Game.give_territory().
+        owner_index (int): Position of this territory in its owner's territories list, so Game.give_territory() can remove it in O(1).
     """
+    __slots__ = ("name", "continent", "owner", "armies", "neighbors", "id", "bit", "neighbor_mask", "neighbor_of",
+                 "enemy_neighbor_count", "owner_index")
+
     def __init__(self, name, continent, neighbors):
         self.name = name
         self.continent = continent
         self.owner = None
         self.armies = 0
         self.neighbors = neighbors  # List of adjacent territory names
+        self.id = None
+        self.bit = 0
+        self.neighbor_mask = 0
+        self.neighbor_of = []
+        self.enemy_neighbor_count = 0
+        self.owner_index = None
 
     def get_connected_territories(self):
         """
@@ -86,16 +113,20 @@ class Territory:
                                         via same-owner paths. Can be empty.
         """
         connected = []
-        visited = {self}  # Set to avoid repeats
-        queue = [self]
+        # Bitmask of territories not to enter: already visited, or not owned by our owner.
+        blocked = self.bit | ~self.owner.territory_mask
+        queue = deque((self,))
+        # Hoisted out of the traversal loop.
+        connected_append, queue_append = connected.append, queue.append
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             for neighbor in current.neighbors:
-                if neighbor.owner == self.owner and neighbor not in visited:
-                    visited.add(neighbor)
-                    connected.append(neighbor)
-                    queue.append(neighbor)
+                bit = neighbor.bit
+                if not blocked & bit:
+                    blocked |= bit
+                    connected_append(neighbor)
+                    queue_append(neighbor)
 
         return connected
 
@@ -117,7 +148,11 @@ class Player:
         continents (list[Continent]): Continents owned by the player.
         cards (list[Card]): Cards held by the player.
         armies (int): Total number of armies the player has, including income at the start of draft phase.
+            Set by update_army_count() at setup, then kept up to date as armies are drafted, lost in battle,
+            or granted by a card trade.
         aatd (int): Armies Available to Draft. Total number of armies the player is allowed to deploy during draft phase.
+        territory_mask (int): Bitmask of owned territories' ids. A territory t has an enemy neighbor iff
+            `t.neighbor_mask & ~territory_mask` is nonzero.
 
     Methods:
         update_army_count(): Recalculates and updates the total army count based on territories.
@@ -130,6 +165,7 @@ class Player:
         fortify(): User chooses a territory to fortify troops from and to, and how much.
         trade(): User chooses cards to trade in.
     """
+    __slots__ = ("name", "territories", "continents", "cards", "armies", "aatd", "territory_mask")
 
     def __init__(self, name):
         self.name = name
@@ -138,12 +174,13 @@ class Player:
         self.cards = []
         self.armies = 0
         self.aatd = 3
+        self.territory_mask = 0
 
     def update_army_count(self):
         """
         Recalculates the total number of armies by summing the armies in all owned territories.
-        Also reevaluates continent ownership
-        Player.armies is set to this value.
+        Player.armies is set to this value. Game keeps Player.armies current incrementally, so this is only
+        needed at setup (or to audit the running total).
 
         Returns:
             int: Updated total army count.
@@ -188,14 +225,15 @@ class Player:
         Returns:
             int: number of bonus troops gained.
         """
-        # Remove cards from player's hand
+        # Remove cards from player's hand, and count card types (jokers separately) in the same pass
+        unique_types = set()
+        jokers = 0
         for card in chosen_set:
             self.cards.remove(card)
-
-        # Count card types, ignoring jokers
-        types = [card.type for card in chosen_set if card.type != "Joker"]
-        jokers = sum(1 for card in chosen_set if card.type == "Joker")
-        unique_types = set(types)
+            if card.type == "Joker":
+                jokers += 1
+            else:
+                unique_types.add(card.type)
 
         bonus = 0
         if len(unique_types) + jokers == 3:
@@ -213,8 +251,9 @@ class Player:
 
         # Find first card territory owned by player, add 2 to it.
         for card in chosen_set:
-            if card.territory in self.territories:
+            if card.territory and card.territory.owner is self:
                 card.territory.armies += 2
+                self.armies += 2
                 break
         
         self.aatd += bonus
@@ -237,29 +276,12 @@ class Player:
             # Guaranteed at least one valid set
             return True
 
-        # For 3 or 4 cards, manually check all 3-card subsets
-        subsets = []
-        if n == 3:
-            subsets = [chosen_set]
-        elif n == 4:
-            # 4 choose 3 = 4 subsets
-            subsets = [
-                [chosen_set[0], chosen_set[1], chosen_set[2]],
-                [chosen_set[0], chosen_set[1], chosen_set[3]],
-                [chosen_set[0], chosen_set[2], chosen_set[3]],
-                [chosen_set[1], chosen_set[2], chosen_set[3]],
-            ]
-
-        for subset in subsets:
-            types = [card.type for card in subset if card.type != "Joker"]
-            jokers = sum(1 for card in subset if card.type == "Joker")
-            unique_types = set(types)
-
-            # Three of a kind
-            if len(unique_types) == 1 or len(unique_types) + jokers == 3:
-                return True
-
-        return False
+        # For 3 or 4 cards, a set exists iff jokers can complete either three of a kind or one of each type.
+        counts = Counter(card.type for card in chosen_set)
+        jokers = counts.pop("Joker", 0)
+        if len(counts) + jokers >= 3:
+            return True
+        return any(count + jokers >= 3 for count in counts.values())
 
 
 
@@ -281,11 +303,10 @@ class Player:
                 if input_territory.lower() == "back":
                     print("[ERROR] You are already at the first step.")
                     continue
-                owned_territory_names = [t.name for t in self.territories]
-                if input_territory not in owned_territory_names:
+                selected_territory = next((t for t in self.territories if t.name == input_territory), None)
+                if selected_territory is None:
                     print("[ERROR] You do not own a territory with this name. Please try again.")
                     continue
-                selected_territory = next(t for t in self.territories if t.name == input_territory)
                 step = 1
 
             elif step == 1:
@@ -322,35 +343,37 @@ class Player:
                 from_name = input("[PROMPT] Attack from which territory? ")
                 if from_name.lower() in {"skip", "end"}:
                     return None
-                try:
-                    from_territory = next(t for t in self.territories if t.name == from_name)
-                    if from_territory.armies < 2:
-                        print("[ERROR] You need at least 2 troops to attack from this territory.")
-                        continue
-                    if not any(n.owner != self for n in from_territory.neighbors):
-                        print("[ERROR] This territory has no enemy neighbors to attack.")
-                        continue
-                    step = 1
-                except StopIteration:
+                from_territory = next((t for t in self.territories if t.name == from_name), None)
+                if from_territory is None:
                     print("[ERROR] You do not own a territory with this name. Please try again.")
+                    continue
+                if from_territory.armies < 2:
+                    print("[ERROR] You need at least 2 troops to attack from this territory.")
+                    continue
+                if not from_territory.enemy_neighbor_count:
+                    print("[ERROR] This territory has no enemy neighbors to attack.")
+                    continue
+                # Built once per attacking territory, and kept across re-prompts and 'back' from step 2.
+                enemy_neighbors = {n.name: n for n in from_territory.neighbors if n.owner is not self}
+                options = "\n".join([str(n) for n in enemy_neighbors.values()])
+                step = 1
 
             elif step == 1:
-                enemy_neighbors = [n for n in from_territory.neighbors if n.owner != self]
-                options = "\n".join([str(n) for n in enemy_neighbors])
                 dest_name = input(f"[PROMPT] Which enemy territory do you want to attack? Options: \n{options}\n")
                 if dest_name.lower() in {"skip", "end"}:
                     return None
                 elif dest_name.lower() == "back":
                     step = 0
                     continue
-                try:
-                    dest_territory = next(n for n in enemy_neighbors if n.name == dest_name)
-                    step = 2
-                except StopIteration:
+                dest_territory = enemy_neighbors.get(dest_name)
+                if dest_territory is None:
                     print("[ERROR] Invalid target. Please pick a valid enemy neighbor.")
+                    continue
+                step = 2
 
             elif step == 2:
-                response = input(f"[PROMPT] How many troops to attack with? (1–{from_territory.armies-1}): ")
+                max_attack = from_territory.armies - 1
+                response = input(f"[PROMPT] How many troops to attack with? (1–{max_attack}): ")
                 if response.lower() in {"skip", "end"}:
                     return None
                 elif response.lower() == "back":
@@ -358,11 +381,11 @@ class Player:
                     continue
                 try:
                     amount = int(response)
-                    if amount < 1 or amount > from_territory.armies-1:
+                    if amount < 1 or amount > max_attack:
                         raise ValueError
                     return from_territory, dest_territory, amount
                 except ValueError:
-                    print(f"[ERROR] Invalid input. You must choose between 1 and {from_territory.armies-1}.")
+                    print(f"[ERROR] Invalid input. You must choose between 1 and {max_attack}.")
     
     def move_troops(self, from_territory, dest_territory, amt):
         """
@@ -400,32 +423,32 @@ class Player:
                 from_name = input("[PROMPT] Fortify from which territory? ")
                 if from_name.lower() in {"skip", "end"}:
                     return None
-                try:
-                    from_territory = next(t for t in self.territories if t.name == from_name)
-                    if from_territory.armies < 2:
-                        print("[INFO] You need at least 2 troops to fortify from this territory.")
-                        continue
-                    connected_owned = from_territory.get_connected_territories()
-                    if not connected_owned:
-                        print("[INFO] No connected territories you own to fortify to.")
-                        continue
-                    step = 1
-                except StopIteration:
+                from_territory = next((t for t in self.territories if t.name == from_name), None)
+                if from_territory is None:
                     print("[ERROR] You do not own a territory with this name. Please try again.")
+                    continue
+                if from_territory.armies < 2:
+                    print("[INFO] You need at least 2 troops to fortify from this territory.")
+                    continue
+                connected_owned = {t.name: t for t in from_territory.get_connected_territories()}
+                if not connected_owned:
+                    print("[INFO] No connected territories you own to fortify to.")
+                    continue
+                options = "\n".join([str(t) for t in connected_owned.values()])
+                step = 1
 
             elif step == 1:
-                options = "\n".join([str(t) for t in connected_owned])
                 dest_name = input(f"[PROMPT] Fortify to which connected territory? Options:\n{options}\n")
                 if dest_name.lower() in {"skip", "end"}:
                     return None
                 elif dest_name.lower() == "back":
                     step = 0
                     continue
-                try:
-                    dest_territory = next(t for t in connected_owned if t.name == dest_name)
-                    step = 2
-                except StopIteration:
+                dest_territory = connected_owned.get(dest_name)
+                if dest_territory is None:
                     print("[ERROR] Invalid target. Please choose a valid connected owned territory.")
+                    continue
+                step = 2
 
             elif step == 2:
                 max_movable = from_territory.armies - 1